@@ -5,31 +5,44 @@
 from __future__ import annotations
 
 import ctypes
-import inspect
 import sys
 import warnings
 from collections.abc import Callable
 from types import CodeType, FrameType, FunctionType, MethodType, ModuleType
-from typing import TYPE_CHECKING, Any
+from typing import Any, Literal
 
 from .types import IdentifierType
-from .util import call_in_frame, get_line_numbers
-
-if TYPE_CHECKING:  # pragma: no cover
-    from .handler import EventHandler
-
+from .util import call_in_frame, get_func_args, get_line_numbers, resolve_func_args
 
 DISABLE = sys.monitoring.DISABLE
 
+LocalsToFast: Callable[[FrameType, int], None] | None
+if sys.version_info < (3, 13):
+    LocalsToFast = ctypes.pythonapi.PyFrame_LocalsToFast
+    LocalsToFast.argtypes = [ctypes.py_object, ctypes.c_int]
+    LocalsToFast.restype = None
+else:
+    # frame.f_locals is a write-through FrameLocalsProxy since 3.13 (PEP 667)
+    LocalsToFast = None
+
 
 class Callback:
     def __init__(self, func: str | Callable, **kwargs):
+        self._kind: Literal["code", "goto", "function"]
         if isinstance(func, str):
-            pass
-        elif inspect.isfunction(func):
-            self.func_args = inspect.getfullargspec(func).args
-        elif inspect.ismethod(func):
-            self.func_args = inspect.getfullargspec(func).args
+            if func == "goto":
+                self._kind = "goto"
+            else:
+                self._kind = "code"
+                try:
+                    self._compiled = compile(func, "<dowhen-callback>", "exec")
+                except SyntaxError:
+                    raise ValueError(f"Invalid callback code: {func}")
+        elif isinstance(func, (FunctionType, MethodType)):
+            self._kind = "function"
+            self.func_args = get_func_args(func)
+            self._noargs = not self.func_args
+            self._resolved_args = resolve_func_args(func)
         else:
             raise TypeError(f"Unsupported callback type: {type(func)}. ")
         self.func = func
@@ -37,19 +50,15 @@ class Callback:
 
     def __call__(self, frame: FrameType, **kwargs) -> Any:
         ret = None
-        if isinstance(self.func, str):
-            if self.func == "goto":  # pragma: no cover
-                self._call_goto(frame)
-            else:
-                self._call_code(frame)
-        elif inspect.isfunction(self.func) or inspect.ismethod(self.func):
+        kind = self._kind
+        if kind == "code":
+            self._call_code(frame)
+        elif kind == "function":
             ret = self._call_function(frame, **kwargs)
         else:  # pragma: no cover
-            assert False, "Unknown callback type"
+            self._call_goto(frame)
 
-        if sys.version_info < (3, 13):
-            LocalsToFast = ctypes.pythonapi.PyFrame_LocalsToFast
-            LocalsToFast.argtypes = [ctypes.py_object, ctypes.c_int]
+        if LocalsToFast is not None:
             LocalsToFast(frame, 0)
 
         if ret is DISABLE:
@@ -57,14 +66,20 @@ class Callback:
 
     def _call_code(self, frame: FrameType) -> None:
         assert isinstance(self.func, str)
-        exec(self.func, frame.f_globals, frame.f_locals)
+        exec(self._compiled, frame.f_globals, frame.f_locals)
 
     def _call_function(self, frame: FrameType, **kwargs) -> Any:
         assert isinstance(self.func, (FunctionType, MethodType))
-        writeback = call_in_frame(self.func, frame, **kwargs)
+        if self._noargs:
+            # Nothing to pull from the frame, don't materialize f_locals
+            writeback = self.func()
+        else:
+            writeback = call_in_frame(self.func, frame, self._resolved_args, **kwargs)
 
-        f_locals = frame.f_locals
         if isinstance(writeback, dict):
+            # On 3.13+ this is the live FrameLocalsProxy, before that it is
+            # the snapshot that LocalsToFast writes back once in __call__
+            f_locals = frame.f_locals
             for arg, val in writeback.items():
                 if arg not in f_locals:
                     raise TypeError(f"Argument '{arg}' not found in frame locals.")
@@ -140,14 +155,10 @@ class Callback:
         condition: str | Callable[..., bool | Any] | None = None,
         source_hash: str | None = None,
     ) -> "EventHandler":
-        from .trigger import when
-
         trigger = when(
             entity, *identifiers, condition=condition, source_hash=source_hash
         )
 
-        from .handler import EventHandler
-
         handler = EventHandler(trigger, self)
         handler.submit()
 
@@ -157,3 +168,7 @@ class Callback:
 bp = Callback.bp
 do = Callback.do
 goto = Callback.goto
+
+# Both modules depend on Callback, import them once it is defined
+from .handler import EventHandler
+from .trigger import when
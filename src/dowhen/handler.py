@@ -6,11 +6,13 @@ from __future__ import annotations
 
 import sys
 from types import FrameType
-from typing import Any, Callable
+from typing import TYPE_CHECKING, Any, Callable
 
 from .callback import Callback
-from .instrumenter import Instrumenter
-from .trigger import Trigger
+from .instrumenter import get_instrumenter
+
+if TYPE_CHECKING:  # pragma: no cover
+    from .trigger import Trigger
 
 DISABLE = sys.monitoring.DISABLE
 
@@ -21,6 +23,9 @@ class EventHandler:
         self.callbacks: list[Callback] = [callback]
         self.disabled = False
         self.removed = False
+        # The condition never changes, skip should_fire() when there is none
+        self._has_condition = trigger.condition is not None
+        self._update_dispatch()
 
     def disable(self) -> None:
         if self.removed:
@@ -32,30 +37,46 @@ class EventHandler:
             raise RuntimeError("Cannot enable a removed handler.")
         if self.disabled:
             self.disabled = False
-            Instrumenter().restart_events()
+            get_instrumenter().restart_events()
 
     def submit(self) -> None:
-        Instrumenter().submit(self)
+        get_instrumenter().submit(self)
 
     def remove(self) -> None:
-        Instrumenter().remove_handler(self)
+        get_instrumenter().remove_handler(self)
         self.removed = True
 
     def __call__(self, frame: FrameType, **kwargs) -> Any:
         if not self.disabled:
             if not self.trigger.has_event(frame):
                 return DISABLE
-            should_fire = self.trigger.should_fire(frame)
+            should_fire = (
+                self.trigger.should_fire(frame) if self._has_condition else True
+            )
             if should_fire is DISABLE:
                 self.disable()
             elif should_fire:
-                for cb in self.callbacks:
-                    if cb(frame, **kwargs) is DISABLE:
-                        self.disable()
+                if self._run_callbacks(frame, **kwargs) is DISABLE:
+                    self.disable()
 
         if self.disabled:
             return DISABLE
 
+    def _update_dispatch(self) -> None:
+        # The overwhelmingly common case is a single callback, call it
+        # directly instead of going through the loop on every event
+        if len(self.callbacks) == 1:
+            self._run_callbacks: Callable[..., Any] = self.callbacks[0]
+        else:
+            self._run_callbacks = self._run_all_callbacks
+
+    def _run_all_callbacks(self, frame: FrameType, **kwargs) -> Any:
+        ret = None
+        for cb in self.callbacks:
+            if cb(frame, **kwargs) is DISABLE:
+                ret = DISABLE
+        return ret
+
     def __enter__(self) -> "EventHandler":
         return self
 
@@ -63,19 +84,16 @@ class EventHandler:
         self.remove()
 
     def bp(self) -> "EventHandler":
-        from .callback import Callback
-
         self.callbacks.append(Callback.bp())
+        self._update_dispatch()
         return self
 
     def do(self, func: str | Callable) -> "EventHandler":
-        from .callback import Callback
-
         self.callbacks.append(Callback.do(func))
+        self._update_dispatch()
         return self
 
     def goto(self, target: str | int) -> "EventHandler":
-        from .callback import Callback
-
         self.callbacks.append(Callback.goto(target))
+        self._update_dispatch()
         return self
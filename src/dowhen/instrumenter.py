@@ -4,7 +4,6 @@
 from __future__ import annotations
 
 import sys
-from collections import defaultdict
 from types import CodeType, FrameType
 from typing import TYPE_CHECKING
 
@@ -14,19 +13,42 @@ if TYPE_CHECKING:  # pragma: no cover
 E = sys.monitoring.events
 DISABLE = sys.monitoring.DISABLE
 
+# The monitoring callbacks run on every event, avoid the attribute lookups
+_getframe = sys._getframe
+
+_GLOBAL_KEY = id(None)
+_NO_LINES: frozenset[int | None] = frozenset()
+
+HandlerTable = dict[int, "EventHandler"]
+
 
 class Instrumenter:
+    _instance: Instrumenter | None = None
     _initialized: bool = False
 
     def __new__(cls, *args, **kwargs) -> Instrumenter:
-        if not hasattr(cls, "_instance"):
+        if cls._instance is None:
             cls._instance = super().__new__(cls)
         return cls._instance
 
     def __init__(self, tool_id: int = 4):
         if not self._initialized:
             self.tool_id = tool_id
-            self.handlers: defaultdict[CodeType | None, dict] = defaultdict(dict)
+            # All handler tables are keyed by id(code) so the hot callbacks
+            # never hash a code object. Global handlers use id(None).
+            # Handlers themselves are stored by id(handler) for O(1) removal.
+            self.line_handlers: dict[tuple[int, int], HandlerTable] = {}
+            self.wildcard_line_handlers: dict[int, HandlerTable] = {}
+            self.start_handlers: dict[int, HandlerTable] = {}
+            self.return_handlers: dict[int, HandlerTable] = {}
+            # Line numbers with handlers per code, None stands for every line
+            self._active_lines: dict[int, frozenset[int | None]] = {}
+            # Keeps the instrumented code objects alive so their ids stay valid
+            self._codes: dict[int, CodeType | None] = {}
+            # The events we have set per code, to avoid reading them back
+            self._event_mask: dict[int, int] = {}
+            # Set by register_* so submit() restarts events once per handler
+            self._pending_restart = False
 
             sys.monitoring.use_tool_id(self.tool_id, "dowhen instrumenter")
             sys.monitoring.register_callback(self.tool_id, E.LINE, self.line_callback)
@@ -39,12 +61,42 @@ class Instrumenter:
             self._initialized = True
 
     def clear_all(self) -> None:
-        for code in self.handlers:
+        # Only codes with events left are in _codes, see _set_events()
+        for code in self._codes.values():
             if code is None:
                 sys.monitoring.set_events(self.tool_id, E.NO_EVENTS)
             else:
                 sys.monitoring.set_local_events(self.tool_id, code, E.NO_EVENTS)
-        self.handlers.clear()
+        self.line_handlers.clear()
+        self.wildcard_line_handlers.clear()
+        self.start_handlers.clear()
+        self.return_handlers.clear()
+        self._active_lines.clear()
+        self._event_mask.clear()
+        self._codes.clear()
+
+    def _add_events(self, code: CodeType | None, events: int) -> None:
+        key = id(code)
+        self._set_events(code, self._event_mask.get(key, 0) | events)
+
+    def _remove_events(self, code: CodeType | None, events: int) -> None:
+        key = id(code)
+        self._set_events(code, self._event_mask.get(key, 0) & ~events)
+
+    def _set_events(self, code: CodeType | None, mask: int) -> None:
+        key = id(code)
+        if self._event_mask.get(key, 0) == mask:
+            return
+        if code is None:
+            sys.monitoring.set_events(self.tool_id, mask)
+        else:
+            sys.monitoring.set_local_events(self.tool_id, code, mask)
+        if mask:
+            self._event_mask[key] = mask
+        else:
+            # No handler is left for this code, stop keeping it alive
+            del self._event_mask[key]
+            del self._codes[key]
 
     def submit(self, event_handler: "EventHandler") -> None:
         trigger = event_handler.trigger
@@ -65,88 +117,106 @@ class Instrumenter:
             elif event.event_type == "return":
                 self.register_return_event(code, event_handler)
 
+        if self._pending_restart:
+            sys.monitoring.restart_events()
+            self._pending_restart = False
+
     def register_line_event(
         self, code: CodeType | None, line_number: int, event_handler: "EventHandler"
     ) -> None:
-        self.handlers[code].setdefault("line", {}).setdefault(line_number, []).append(
-            event_handler
-        )
-
-        if code is None:
-            events = sys.monitoring.get_events(self.tool_id)
-            sys.monitoring.set_events(self.tool_id, events | E.LINE)
+        key = id(code)
+        self._codes[key] = code
+        if line_number is None:
+            handlers = self.wildcard_line_handlers.setdefault(key, {})
         else:
-            events = sys.monitoring.get_local_events(self.tool_id, code)
-            sys.monitoring.set_local_events(self.tool_id, code, events | E.LINE)
-        sys.monitoring.restart_events()
+            handlers = self.line_handlers.setdefault((key, line_number), {})
+        handlers[id(event_handler)] = event_handler
+        self._active_lines[key] = self._active_lines.get(key, _NO_LINES) | {line_number}
+
+        self._add_events(code, E.LINE)
+        self._pending_restart = True
 
     def line_callback(self, code: CodeType, line_number: int):  # pragma: no cover
-        handlers = []
-        if None in self.handlers:
-            handlers.extend(self.handlers[None].get("line", {}).get(line_number, []))
-            handlers.extend(self.handlers[None].get("line", {}).get(None, []))
-        if code in self.handlers:
-            handlers.extend(self.handlers[code].get("line", {}).get(line_number, []))
-            handlers.extend(self.handlers[code].get("line", {}).get(None, []))
-        if handlers:
-            return self._process_handlers(handlers, sys._getframe(1))
-        return sys.monitoring.DISABLE
+        key = id(code)
+        wildcard_line_handlers = self.wildcard_line_handlers
+        handlers = self.line_handlers.get((key, line_number))
+        if (
+            key not in wildcard_line_handlers
+            and _GLOBAL_KEY not in wildcard_line_handlers
+        ):
+            if handlers is None:
+                return DISABLE
+            if len(handlers) == 1:
+                (handler,) = handlers.values()
+                return handler(_getframe(1))
+            return self._process_handlers(_getframe(1), handlers)
+        return self._process_handlers(
+            _getframe(1),
+            wildcard_line_handlers.get(_GLOBAL_KEY),
+            handlers,
+            wildcard_line_handlers.get(key),
+        )
 
     def register_start_event(
         self, code: CodeType | None, event_handler: "EventHandler"
     ) -> None:
-        self.handlers[code].setdefault("start", []).append(event_handler)
+        key = id(code)
+        self._codes[key] = code
+        self.start_handlers.setdefault(key, {})[id(event_handler)] = event_handler
 
-        if code is None:
-            events = sys.monitoring.get_events(self.tool_id)
-            sys.monitoring.set_events(self.tool_id, events | E.PY_START)
-        else:
-            events = sys.monitoring.get_local_events(self.tool_id, code)
-            sys.monitoring.set_local_events(self.tool_id, code, events | E.PY_START)
-        sys.monitoring.restart_events()
+        self._add_events(code, E.PY_START)
+        self._pending_restart = True
 
     def start_callback(self, code: CodeType, offset: int):  # pragma: no cover
-        handlers = []
-        if None in self.handlers:
-            handlers.extend(self.handlers[None].get("start", []))
-        if code in self.handlers:
-            handlers.extend(self.handlers[code].get("start", []))
-        if handlers:
-            return self._process_handlers(handlers, sys._getframe(1))
-        return sys.monitoring.DISABLE
+        start_handlers = self.start_handlers
+        handlers = start_handlers.get(id(code))
+        global_handlers = start_handlers.get(_GLOBAL_KEY)
+        if global_handlers is None:
+            if handlers is None:
+                return DISABLE
+            if len(handlers) == 1:
+                (handler,) = handlers.values()
+                return handler(_getframe(1))
+        return self._process_handlers(_getframe(1), global_handlers, handlers)
 
     def register_return_event(
         self, code: CodeType | None, event_handler: "EventHandler"
     ) -> None:
-        self.handlers[code].setdefault("return", []).append(event_handler)
+        key = id(code)
+        self._codes[key] = code
+        self.return_handlers.setdefault(key, {})[id(event_handler)] = event_handler
 
-        if code is None:
-            events = sys.monitoring.get_events(self.tool_id)
-            sys.monitoring.set_events(self.tool_id, events | E.PY_RETURN)
-        else:
-            events = sys.monitoring.get_local_events(self.tool_id, code)
-            sys.monitoring.set_local_events(self.tool_id, code, events | E.PY_RETURN)
-        sys.monitoring.restart_events()
+        self._add_events(code, E.PY_RETURN)
+        self._pending_restart = True
 
     def return_callback(
         self, code: CodeType, offset: int, retval: object
     ):  # pragma: no cover
-        handlers = []
-        if None in self.handlers:
-            handlers.extend(self.handlers[None].get("return", []))
-        if code in self.handlers:
-            handlers.extend(self.handlers[code].get("return", []))
-        if handlers:
-            return self._process_handlers(handlers, sys._getframe(1), retval=retval)
-        return sys.monitoring.DISABLE
+        return_handlers = self.return_handlers
+        handlers = return_handlers.get(id(code))
+        global_handlers = return_handlers.get(_GLOBAL_KEY)
+        if global_handlers is None:
+            if handlers is None:
+                return DISABLE
+            if len(handlers) == 1:
+                (handler,) = handlers.values()
+                return handler(_getframe(1), retval=retval)
+        return self._process_handlers(
+            _getframe(1), global_handlers, handlers, retval=retval
+        )
 
     def _process_handlers(
-        self, handlers: list["EventHandler"], frame: FrameType, **kwargs
+        self, frame: FrameType, *tables: HandlerTable | None, **kwargs
     ):  # pragma: no cover
-        disable = sys.monitoring.DISABLE
-        for handler in handlers:
-            disable = handler(frame, **kwargs) and disable
-        return sys.monitoring.DISABLE if disable else None
+        # Keep monitoring this location as long as any handler wants it
+        ret = DISABLE
+        for handlers in tables:
+            if handlers:
+                # Handlers may remove themselves while we iterate
+                for handler in tuple(handlers.values()):
+                    if handler(frame, **kwargs) is not DISABLE:
+                        ret = None
+        return ret
 
     def restart_events(self) -> None:
         sys.monitoring.restart_events()
@@ -155,42 +225,54 @@ class Instrumenter:
         trigger = event_handler.trigger
         for event in trigger.events:
             code = event.code
-            if code not in self.handlers or event.event_type not in self.handlers[code]:
-                continue
+            key = id(code)
             if event.event_type == "line":
                 assert (
                     isinstance(event.event_data, dict)
                     and "line_number" in event.event_data
                 )
-                handlers = self.handlers[code]["line"].get(
-                    event.event_data["line_number"], []
-                )
+                line_number = event.event_data["line_number"]
+                if line_number is None:
+                    table: dict = self.wildcard_line_handlers
+                    table_key: int | tuple[int, int] = key
+                else:
+                    table = self.line_handlers
+                    table_key = (key, line_number)
+            elif event.event_type == "start":
+                table, table_key = self.start_handlers, key
             else:
-                handlers = self.handlers[code][event.event_type]
-
-            if event_handler in handlers:
-                handlers.remove(event_handler)
-
-                if event.event_type == "line" and not handlers:
-                    assert (
-                        isinstance(event.event_data, dict)
-                        and "line_number" in event.event_data
-                    )
-                    del self.handlers[code]["line"][event.event_data["line_number"]]
-
-                if not self.handlers[code][event.event_type]:
-                    del self.handlers[code][event.event_type]
-                    removed_event = {
-                        "line": E.LINE,
-                        "start": E.PY_START,
-                        "return": E.PY_RETURN,
-                    }[event.event_type]
-
-                    if code is None:
-                        events = sys.monitoring.get_events(self.tool_id)
-                        sys.monitoring.set_events(self.tool_id, events & ~removed_event)
-                    else:
-                        events = sys.monitoring.get_local_events(self.tool_id, code)
-                        sys.monitoring.set_local_events(
-                            self.tool_id, code, events & ~removed_event
-                        )
+                table, table_key = self.return_handlers, key
+
+            handlers = table.get(table_key)
+            if handlers is None or handlers.pop(id(event_handler), None) is None:
+                continue
+
+            if handlers:
+                continue
+            del table[table_key]
+
+            if event.event_type == "line":
+                lines = self._active_lines[key] - {line_number}
+                if lines:
+                    self._active_lines[key] = lines
+                    continue
+                del self._active_lines[key]
+                removed_event = E.LINE
+            elif event.event_type == "start":
+                removed_event = E.PY_START
+            else:
+                removed_event = E.PY_RETURN
+
+            self._remove_events(code, removed_event)
+
+
+# The singleton used by the rest of the package. It is created on first use,
+# not at import, because creating it claims the monitoring tool id
+_instrumenter: Instrumenter | None = None
+
+
+def get_instrumenter() -> Instrumenter:
+    global _instrumenter
+    if _instrumenter is None:
+        _instrumenter = Instrumenter()
+    return _instrumenter
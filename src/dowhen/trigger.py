@@ -5,20 +5,52 @@
 from __future__ import annotations
 
 import inspect
+import operator
 import sys
+import weakref
 from collections.abc import Callable
 from types import CodeType, FrameType, FunctionType, MethodType, ModuleType
-from typing import TYPE_CHECKING, Any, Literal
+from typing import Any, Literal
 
 from .types import IdentifierType
-from .util import call_in_frame, get_line_numbers, get_source_hash, getrealsourcelines
+from .util import (
+    ResolvedArgs,
+    call_in_frame,
+    get_line_numbers,
+    get_source_hash,
+    getrealsourcelines,
+    resolve_func_args,
+)
 
-if TYPE_CHECKING:  # pragma: no cover
-    from .callback import Callback
-    from .handler import EventHandler
+DISABLE = sys.monitoring.DISABLE
 
+# Scanning the members of a module or a class is expensive, and the same
+# module is often used for many triggers. Each entry also records the
+# functions found in the namespaces, reloading a module or patching a class
+# replaces them and invalidates the entry. Cleared by clear_all().
+_code_cache: weakref.WeakKeyDictionary[
+    ModuleType | type, tuple[tuple[object, ...], list[CodeType]]
+] = weakref.WeakKeyDictionary()
+
+
+def _get_namespace_functions(entity: ModuleType | type) -> list[object]:
+    namespaces = entity.__mro__ if isinstance(entity, type) else (entity,)
+    return [
+        obj
+        for namespace in namespaces
+        for obj in vars(namespace).values()
+        if isinstance(obj, (FunctionType, MethodType, CodeType))
+    ]
+
+
+def _ref_function(obj: object) -> object:
+    # Methods using super() hold a reference to their class, a strong
+    # reference would keep the WeakKeyDictionary key alive
+    return obj if isinstance(obj, CodeType) else weakref.ref(obj)
 
-DISABLE = sys.monitoring.DISABLE
+
+def _deref_function(ref: object) -> object:
+    return ref() if isinstance(ref, weakref.ref) else ref
 
 
 class _Event:
@@ -43,6 +75,15 @@ class Trigger:
         self.events = events
         self.condition = condition
         self.is_global = is_global
+        self._condition_code: CodeType | None = None
+        self._condition_args: ResolvedArgs | None = None
+        if isinstance(condition, str):
+            try:
+                self._condition_code = compile(condition, "<string>", "eval")
+            except SyntaxError:
+                raise ValueError(f"Invalid condition expression: {condition}")
+        elif condition is not None:
+            self._condition_args = resolve_func_args(condition)
 
     @classmethod
     def _get_code_from_entity(
@@ -58,7 +99,15 @@ class Trigger:
         if entity is None:
             return [None]
 
-        if inspect.ismodule(entity) or inspect.isclass(entity):
+        if isinstance(entity, (ModuleType, type)):
+            functions = _get_namespace_functions(entity)
+            cached = _code_cache.get(entity)
+            if cached is not None:
+                cached_functions, cached_code_objects = cached
+                if len(cached_functions) == len(functions) and all(
+                    map(operator.is_, map(_deref_function, cached_functions), functions)
+                ):
+                    return cached_code_objects
             for _, obj in inspect.getmembers_static(
                 entity, lambda o: isinstance(o, (FunctionType, MethodType, CodeType))
             ):
@@ -66,19 +115,23 @@ class Trigger:
         else:
             entity_list.append(entity)
 
-        for entity in entity_list:
-            if inspect.isfunction(entity) or inspect.ismethod(entity):
-                entity = inspect.unwrap(entity)
-                if inspect.isfunction(entity) or inspect.ismethod(entity):
-                    code_objects.append(entity.__code__)
+        for obj in entity_list:
+            if isinstance(obj, (FunctionType, MethodType)):
+                obj = inspect.unwrap(obj)
+                if isinstance(obj, (FunctionType, MethodType)):
+                    code_objects.append(obj.__code__)
                 else:  # pragma: no cover
-                    raise TypeError(
-                        f"Expected a function or method, got {type(entity)}"
-                    )
-            elif inspect.iscode(entity):
-                code_objects.append(entity)
+                    raise TypeError(f"Expected a function or method, got {type(obj)}")
+            elif isinstance(obj, CodeType):
+                code_objects.append(obj)
             else:
-                raise TypeError(f"Unknown entity type: {type(entity)}")
+                raise TypeError(f"Unknown entity type: {type(obj)}")
+
+        if isinstance(entity, (ModuleType, type)):
+            _code_cache[entity] = (
+                tuple(map(_ref_function, functions)),
+                code_objects,
+            )
 
         return code_objects
 
@@ -129,12 +182,11 @@ class Trigger:
         condition: str | Callable[..., bool | Any] | None = None,
         source_hash: str | None = None,
     ):
-        if isinstance(condition, str):
-            try:
-                compile(condition, "<string>", "eval")
-            except SyntaxError:
-                raise ValueError(f"Invalid condition expression: {condition}")
-        elif condition is not None and not callable(condition):
+        if (
+            condition is not None
+            and not isinstance(condition, str)
+            and not callable(condition)
+        ):
             raise TypeError(
                 f"Condition must be a string or callable, got {type(condition)}"
             )
@@ -194,18 +246,12 @@ class Trigger:
         return cls(events, condition=condition, is_global=entity is None)
 
     def bp(self) -> "EventHandler":
-        from .callback import Callback
-
         return self._submit_callback(Callback.bp())
 
     def do(self, func: str | Callable) -> "EventHandler":
-        from .callback import Callback
-
         return self._submit_callback(Callback.do(func))
 
     def goto(self, target: str | int) -> "EventHandler":
-        from .callback import Callback
-
         return self._submit_callback(Callback.goto(target))
 
     def has_event(self, frame: FrameType) -> bool | Any:
@@ -225,18 +271,17 @@ class Trigger:
         if self.condition is None:
             return True
         try:
-            if isinstance(self.condition, str):
-                return eval(self.condition, frame.f_globals, frame.f_locals)
+            if self._condition_code is not None:
+                return eval(self._condition_code, frame.f_globals, frame.f_locals)
             elif callable(self.condition):
-                return call_in_frame(self.condition, frame)
+                assert self._condition_args is not None
+                return call_in_frame(self.condition, frame, self._condition_args)
         except Exception:
             return False
 
         assert False, "Unknown condition type"  # pragma: no cover
 
     def _submit_callback(self, callback: "Callback") -> "EventHandler":
-        from .handler import EventHandler
-
         handler = EventHandler(self, callback)
         handler.submit()
 
@@ -244,3 +289,7 @@ class Trigger:
 
 
 when = Trigger.when
+
+# Both modules depend on Trigger, import them once it is defined
+from .callback import Callback
+from .handler import EventHandler
@@ -7,6 +7,8 @@ from __future__ import annotations
 import functools
 import inspect
 import re
+import weakref
+import zlib
 from collections.abc import Callable
 from types import CodeType, FrameType, FunctionType, MethodType, ModuleType
 from typing import Any
@@ -50,6 +52,54 @@ def get_all_code_objects(code: CodeType) -> list[CodeType]:
 
 
 @functools.lru_cache(maxsize=256)
+def get_stripped_source_lines(code: CodeType) -> tuple[tuple[str, ...], int]:
+    """
+    Get the stripped source lines of the code object and its start line.
+    """
+    lines, start_line = getrealsourcelines(code)
+    return tuple(line.strip() for line in lines), start_line
+
+
+@functools.lru_cache(maxsize=256)
+def get_stripped_source(code: CodeType) -> str:
+    """
+    Get the stripped source lines of the code object joined as one string.
+    """
+    lines, _ = get_stripped_source_lines(code)
+    return "\n".join(lines)
+
+
+def _int_line_numbers(code: CodeType, ident: int) -> set[int]:
+    return {ident}
+
+
+def _pattern_line_numbers(code: CodeType, ident: re.Pattern) -> set[int]:
+    lines, start_line = get_stripped_source_lines(code)
+    return {start_line + i for i, line in enumerate(lines) if ident.match(line)}
+
+
+# Identifier types that are resolved per identifier, looked up by exact type.
+# Strings are matched together in one pass in get_line_numbers.
+_IDENT_HANDLERS: dict[type, Callable[[CodeType, Any], set[int]]] = {
+    int: _int_line_numbers,
+    re.Pattern: _pattern_line_numbers,
+}
+
+
+def _get_ident_handler(ident: object) -> Callable[[CodeType, Any], set[int]]:
+    handler = _IDENT_HANDLERS.get(type(ident))
+    if handler is not None:
+        return handler
+    # Subclasses, like IntEnum members, miss the exact type lookup
+    for ident_type, handler in _IDENT_HANDLERS.items():
+        if isinstance(ident, ident_type):
+            return handler
+    raise TypeError(f"Unknown identifier type: {type(ident)}")
+
+
+# Global triggers look up every code object that hits the identifier,
+# so this cache needs to be much larger than the number of triggers
+@functools.lru_cache(maxsize=4096)
 def get_line_numbers(
     code: CodeType, identifier: IdentifierType | tuple[IdentifierType, ...]
 ) -> dict[CodeType, list[int]]:
@@ -57,45 +107,85 @@ def get_line_numbers(
         identifier = (identifier,)
 
     line_numbers_ret: dict[CodeType, list[int]] = {}
-    line_numbers_sets = []
+    line_numbers_sets: list[set[int]] = []
 
-    lines, start_line = getrealsourcelines(code)
+    # Check every identifier type before the string pass can return early
+    ident_handlers = [
+        (ident, _get_ident_handler(ident))
+        for ident in identifier
+        if not isinstance(ident, str)
+    ]
 
-    for ident in identifier:
-        if isinstance(ident, int):
-            line_numbers_set = {ident}
-        else:
-            if isinstance(ident, str) or isinstance(ident, re.Pattern):
-                line_numbers_set = set()
-                for i, line in enumerate(lines):
-                    line = line.strip()
-                    if (isinstance(ident, str) and line.startswith(ident)) or (
-                        isinstance(ident, re.Pattern) and ident.match(line)
-                    ):
-                        line_number = start_line + i
-                        line_numbers_set.add(line_number)
-            else:
-                raise TypeError(f"Unknown identifier type: {type(ident)}")
+    # Match all the string identifiers in a single pass over the source,
+    # str.startswith() accepts a tuple and checks every prefix in C
+    str_idents = tuple(ident for ident in identifier if isinstance(ident, str))
+    str_line_numbers: dict[str, set[int]] = {
+        str_ident: set() for str_ident in str_idents
+    }
+    if str_idents:
+        lines, start_line = get_stripped_source_lines(code)
+        # A substring search over the whole source is much cheaper than the
+        # line loop and rules out identifiers that appear nowhere
+        source = get_stripped_source(code)
+        if any(str_ident not in source for str_ident in str_idents):
+            return {}
+        for i, line in enumerate(lines):
+            if line.startswith(str_idents):
+                for str_ident in str_idents:
+                    if line.startswith(str_ident):
+                        str_line_numbers[str_ident].add(start_line + i)
+        if not all(str_line_numbers.values()):
+            # Some string identifier matches nothing, no need to scan for
+            # the other identifiers
+            return {}
 
+    # Every string identifier matched at least one line at this point
+    line_numbers_sets.extend(str_line_numbers.values())
+    for ident, handler in ident_handlers:
+        line_numbers_set = handler(code, ident)
         if not line_numbers_set:
             return {}
         line_numbers_sets.append(line_numbers_set)
 
-    agreed_line_numbers = set.intersection(*line_numbers_sets)
-    for sub_code in get_all_code_objects(code):
-        for line_number in agreed_line_numbers:
-            if line_number in (line[2] for line in sub_code.co_lines()):
-                line_numbers_ret.setdefault(sub_code, []).append(line_number)
+    # Start from the smallest set so the intersection shrinks quickly
+    line_numbers_sets.sort(key=len)
+    agreed_line_numbers = set(line_numbers_sets[0])
+    for line_numbers_set in line_numbers_sets[1:]:
+        agreed_line_numbers &= line_numbers_set
+        if not agreed_line_numbers:
+            return {}
 
-    for line_numbers in line_numbers_ret.values():
-        line_numbers.sort()
+    for sub_code in get_all_code_objects(code):
+        valid_lines = frozenset(
+            lineno for _, _, lineno in sub_code.co_lines() if lineno is not None
+        )
+        if sub_code_line_numbers := sorted(agreed_line_numbers & valid_lines):
+            line_numbers_ret[sub_code] = sub_code_line_numbers
 
     return line_numbers_ret
 
 
 @functools.lru_cache(maxsize=256)
 def get_func_args(func: Callable) -> list[str]:
-    args = inspect.getfullargspec(inspect.unwrap(func)).args
+    """
+    Get the names of the positional arguments of func. Like
+    inspect.getfullargspec().args, *args, **kwargs and keyword-only
+    arguments are not included.
+    """
+    unwrapped = inspect.unwrap(func)
+    code = getattr(unwrapped, "__code__", None)
+    if isinstance(code, CodeType):
+        # Read them straight from the code object, much cheaper than
+        # building a full signature
+        args = list(code.co_varnames[: code.co_argcount])
+    else:
+        # Other callables, like instances with __call__, have no code
+        # object of their own
+        args = [
+            param.name
+            for param in inspect.signature(unwrapped).parameters.values()
+            if param.kind in (param.POSITIONAL_ONLY, param.POSITIONAL_OR_KEYWORD)
+        ]
     # For bound methods, skip the first argument since it's already bound
     if inspect.ismethod(func):
         return args[1:]
@@ -103,35 +193,91 @@ def get_func_args(func: Callable) -> list[str]:
         return args
 
 
-def call_in_frame(func: Callable, frame: FrameType, **kwargs) -> Any:
-    f_locals = frame.f_locals
-    args = []
-    for arg in get_func_args(func):
+# Argument names, index of _frame, index of _retval (-1 if absent) and the
+# indices of the arguments that come from the frame locals
+ResolvedArgs = tuple[tuple[str, ...], int, int, tuple[tuple[int, str], ...]]
+
+
+def resolve_func_args(func: Callable) -> ResolvedArgs:
+    """
+    Resolve the arguments of func for call_in_frame. Callers keep the result
+    with the callback or condition it belongs to.
+    """
+    argnames = tuple(get_func_args(func))
+    frame_idx = retval_idx = -1
+    plain_indices = []
+    for i, arg in enumerate(argnames):
         if arg == "_frame":
-            argval = frame
+            frame_idx = i
         elif arg == "_retval":
-            if "retval" not in kwargs:
-                raise TypeError("You can only use '_retval' in <return> callbacks.")
-            argval = kwargs["retval"]
-        elif arg in f_locals:
-            argval = f_locals[arg]
+            retval_idx = i
         else:
-            raise TypeError(f"Argument '{arg}' not found in frame locals.")
-        args.append(argval)
+            plain_indices.append((i, arg))
+    return argnames, frame_idx, retval_idx, tuple(plain_indices)
+
+
+def call_in_frame(
+    func: Callable, frame: FrameType, resolved_args: ResolvedArgs, **kwargs
+) -> Any:
+    argnames, frame_idx, retval_idx, plain_indices = resolved_args
+    # Fast paths for the most common signatures: (), (_frame) and (_retval)
+    if not argnames:
+        return func()
+    elif not plain_indices and len(argnames) == 1:
+        if frame_idx == 0:
+            return func(frame)
+        if "retval" not in kwargs:
+            raise TypeError("You can only use '_retval' in <return> callbacks.")
+        return func(kwargs["retval"])
+
+    args: list[Any] = [None] * len(argnames)
+    if frame_idx >= 0:
+        args[frame_idx] = frame
+    if retval_idx >= 0:
+        if "retval" not in kwargs:
+            raise TypeError("You can only use '_retval' in <return> callbacks.")
+        args[retval_idx] = kwargs["retval"]
+    if plain_indices:
+        f_locals = frame.f_locals
+        for i, arg in plain_indices:
+            if arg not in f_locals:
+                raise TypeError(f"Argument '{arg}' not found in frame locals.")
+            args[i] = f_locals[arg]
     return func(*args)
 
 
+# Keyed by the function or class itself, redefining them creates new objects.
+# Modules are not cached because importlib.reload() reuses the module object
+# while its source changes.
+_source_hash_cache: weakref.WeakKeyDictionary[FunctionType | type, str] = (
+    weakref.WeakKeyDictionary()
+)
+
+
 def get_source_hash(entity: CodeType | FunctionType | MethodType | ModuleType | type):
-    import hashlib
+    key = entity.__func__ if isinstance(entity, MethodType) else entity
+    if not isinstance(key, (FunctionType, type)):
+        return _hash_source(entity)
+    source_hash = _source_hash_cache.get(key)
+    if source_hash is None:
+        source_hash = _source_hash_cache[key] = _hash_source(entity)
+    return source_hash
+
 
-    source = inspect.getsource(entity)
-    return hashlib.md5(source.encode("utf-8")).hexdigest()[-8:]
+def _hash_source(entity: object) -> str:
+    source = inspect.getsource(entity)  # type: ignore[arg-type]
+    return format(zlib.crc32(source.encode("utf-8")), "08x")
 
 
 def clear_all() -> None:
-    from .instrumenter import Instrumenter
+    from .instrumenter import get_instrumenter
+    from .trigger import _code_cache
 
-    Instrumenter().clear_all()
+    get_instrumenter().clear_all()
+    _code_cache.clear()
     get_all_code_objects.cache_clear()
     get_line_numbers.cache_clear()
+    get_stripped_source_lines.cache_clear()
+    get_stripped_source.cache_clear()
     get_func_args.cache_clear()
+    _source_hash_cache.clear()
@@ -68,6 +68,30 @@ def test_callback_call():
     assert x == 1
 
 
+callback_events = []
+
+
+def test_callback_locals():
+    def f(x):
+        return x
+
+    with dowhen.do("callback_events.append(0)").when(f, "return x"):
+        assert f(1) == 1
+    with dowhen.do("callback_events.append(x)").when(f, "return x"):
+        assert f(1) == 1
+    with dowhen.do("callback_events.append(sorted(locals()))").when(f, "return x"):
+        assert f(1) == 1
+    with dowhen.do("callback_events.append(sorted(sys._getframe().f_locals))").when(
+        f, "return x"
+    ):
+        assert f(1) == 1
+    with dowhen.do(
+        "callback_events.append(sorted(__import__('inspect').currentframe().f_locals))"
+    ).when(f, "return x"):
+        assert f(1) == 1
+    assert callback_events == [0, 1, ["x"], ["x"], ["x"]]
+
+
 def test_method_callback_call():
     class A:
         def change(self, x):
@@ -160,6 +184,9 @@ def test_callback_invalid_type():
     with pytest.raises(TypeError):
         dowhen.do(123)
 
+    with pytest.raises(ValueError):
+        dowhen.do("x ==")
+
     def f(x):
         return x
 
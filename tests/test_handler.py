@@ -88,6 +88,22 @@ def test_remove():
     handler.remove()
 
 
+def test_remove_in_callback():
+    def f(x):
+        return x
+
+    def remove_self():
+        handler.remove()
+
+    handler = dowhen.do(remove_self).when(f, "return x")
+    other = dowhen.do("x = 1").when(f, "return x")
+
+    assert f(0) == 1
+    assert handler.removed
+    assert f(0) == 1
+    other.remove()
+
+
 def test_with():
     def f(x):
         return x
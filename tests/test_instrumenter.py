@@ -3,6 +3,7 @@
 
 
 import dis
+import subprocess
 import sys
 
 import dowhen
@@ -77,6 +78,26 @@ def test_events_on_same_line():
     )
 
 
+def test_line_events_with_wildcard():
+    def f(x):
+        return x
+
+    handler_line = dowhen.do("x = 1").when(f, "return x")
+    handler_all = dowhen.do("x = 1").when(f)
+    assert sys.monitoring.get_local_events(Instrumenter().tool_id, f.__code__) == E.LINE
+
+    handler_line.remove()
+    assert sys.monitoring.get_local_events(Instrumenter().tool_id, f.__code__) == E.LINE
+    assert f(0) == 1
+
+    handler_all.remove()
+    assert (
+        sys.monitoring.get_local_events(Instrumenter().tool_id, f.__code__)
+        == E.NO_EVENTS
+    )
+    assert f(0) == 0
+
+
 def test_line_event_disabled():
     def f(x):
         x += 1
@@ -142,3 +163,37 @@ def test_disable_from_condition():
     with disable_coverage():
         f(0)
     assert_instrumented_line_count(f, 0)
+
+
+def test_disable_with_multiple_handlers():
+    def f(x):
+        return x
+
+    def cb():
+        return dowhen.DISABLE
+
+    handler_disable = dowhen.do(cb).when(f, "return x")
+    handler_change = dowhen.do("x = 1").when(f, "return x")
+
+    with disable_coverage():
+        assert f(0) == 1
+        assert f(0) == 1
+    assert handler_disable.disabled
+    assert not handler_change.disabled
+    assert_instrumented_line_count(f, 1)
+
+    handler_change.remove()
+    with disable_coverage():
+        assert f(0) == 0
+    assert_instrumented_line_count(f, 0)
+
+
+def test_import_does_not_claim_tool_id():
+    # A fresh interpreter is needed to import dowhen for the first time
+    code = (
+        "import sys\n"
+        "sys.monitoring.use_tool_id(4, 'other')\n"
+        "import dowhen\n"
+        "assert sys.monitoring.get_tool(4) == 'other'\n"
+    )
+    subprocess.run([sys.executable, "-c", code], check=True)
@@ -2,7 +2,9 @@
 # For details: https://github.com/gaogaotiantian/dowhen/blob/master/NOTICE
 
 
+import enum
 import functools
+import importlib
 import re
 import sys
 
@@ -107,6 +109,17 @@ def test_method():
     assert a.f(2) == 1
 
 
+def test_int_subclass():
+    def f(x):
+        return x
+
+    class Line(enum.IntEnum):
+        RETURN = f.__code__.co_firstlineno + 1
+
+    dowhen.when(f, Line.RETURN).do("x = 1")
+    assert f(0) == 1
+
+
 def test_module():
     import random
 
@@ -146,6 +159,42 @@ def test_class():
         assert a.g(2) == 2
 
 
+def test_module_reload(tmp_path, monkeypatch):
+    monkeypatch.setattr(sys, "dont_write_bytecode", True)
+    monkeypatch.syspath_prepend(str(tmp_path))
+    module_path = tmp_path / "dowhen_reload_mod.py"
+    monkeypatch.delitem(sys.modules, "dowhen_reload_mod", raising=False)
+    module_path.write_text("def f(x):\n    return x\n")
+    import dowhen_reload_mod  # type: ignore
+
+    with dowhen.when(dowhen_reload_mod, "return x").do("x = 1"):
+        assert dowhen_reload_mod.f(0) == 1
+
+    module_path.write_text("def f(x):\n    x += 10\n    return x\n")
+    importlib.reload(dowhen_reload_mod)
+
+    with dowhen.when(dowhen_reload_mod, "return x").do("x = 1"):
+        assert dowhen_reload_mod.f(0) == 1
+
+
+def test_class_patch():
+    class A:
+        def f(self, x):
+            return x
+
+    with dowhen.when(A, "return x").do("x = 1"):
+        assert A().f(0) == 1
+
+    def g(self, x):
+        return x
+
+    A.g = g  # type: ignore
+
+    with dowhen.when(A, "return x").do("x = 1"):
+        assert A().f(0) == 1
+        assert A().g(0) == 1
+
+
 def test_decorator():
     def decorator(func):
         @functools.wraps(func)
@@ -298,6 +347,16 @@ def test_condition():
 
     dowhen.clear_all()
 
+    class Cond:
+        def __call__(self, x):
+            return x == 0
+
+    dowhen.when(f, "return x", condition=Cond()).do("x = 1")
+    assert f(0) == 1
+    assert f(2) == 2
+
+    dowhen.clear_all()
+
     with pytest.raises(ValueError):
         dowhen.when(f, "return x", condition="x ==")
 
@@ -320,6 +379,25 @@ def test_source_hash():
         dowhen.when(f, "return x", source_hash=123)
 
 
+def test_source_hash_reload(tmp_path, monkeypatch):
+    monkeypatch.setattr(sys, "dont_write_bytecode", True)
+    monkeypatch.syspath_prepend(str(tmp_path))
+    monkeypatch.delitem(sys.modules, "dowhen_hash_mod", raising=False)
+    module_path = tmp_path / "dowhen_hash_mod.py"
+    module_path.write_text("def f(x):\n    return x\n")
+    import dowhen_hash_mod  # type: ignore
+
+    source_hash = dowhen.get_source_hash(dowhen_hash_mod)
+    assert dowhen.get_source_hash(dowhen_hash_mod) == source_hash
+
+    module_path.write_text("def f(x):\n    x += 10\n    return x\n")
+    importlib.reload(dowhen_hash_mod)
+
+    assert dowhen.get_source_hash(dowhen_hash_mod) != source_hash
+    with pytest.raises(ValueError):
+        dowhen.when(dowhen_hash_mod, "return x", source_hash=source_hash)
+
+
 def test_should_fire():
     def f(x):
         return x
@@ -364,6 +442,9 @@ def test_invalid_type():
     with pytest.raises(TypeError):
         dowhen.when(f, 1.5)
 
+    with pytest.raises(TypeError):
+        dowhen.when(f, (1.5, "unmatched"))
+
     with pytest.raises(ValueError):
         dowhen.when(None, "return", source_hash="12345678")
 
@@ -378,6 +459,11 @@ def test_invalid_line_number():
     with pytest.raises(ValueError):
         dowhen.when(f, "+1000")
 
+    # Not relative line numbers, these are matched against the source
+    for identifier in ("+1 ", "+0_1"):
+        with pytest.raises(ValueError):
+            dowhen.when(f, identifier)
+
     code = compile("pass", "<string>", "exec")
     with pytest.raises(ValueError):
         dowhen.when(code, "return")
@@ -7,15 +7,15 @@ import io
 import sys
 import textwrap
 
+try:
+    import coverage
+except ModuleNotFoundError:
+    coverage = None
+
 
 @contextlib.contextmanager
 def disable_coverage():
-    try:
-        import coverage
-
-        cov = coverage.Coverage().current()
-    except ModuleNotFoundError:
-        cov = None
+    cov = None if coverage is None else coverage.Coverage.current()
 
     if cov is None:
         yield